@@ -0,0 +1,85 @@
+"""
+Benchmark du classement incrémental.
+
+Rejoue plusieurs journées de championnat sur quelques milliers d'équipes,
+appariées au hasard à chaque journée, et compare, après chaque match, la
+skip list de classement.py au tri complet de teams_points fait auparavant
+par ex_basic1_1.py. Le tri complet est lent : garder peu de journées.
+"""
+import argparse
+import random
+import time
+
+from classement import Classement
+
+
+def generer_saison(nb_equipes, nb_journees, graine):
+    # Chaque journée : les équipes sont appariées au hasard, 3 points pour
+    # une victoire, 1 point chacune pour un match nul
+    aleatoire = random.Random(graine)
+    equipes = [f"Equipe {i}" for i in range(nb_equipes)]
+    saison = []
+    for _ in range(nb_journees):
+        aleatoire.shuffle(equipes)
+        for domicile, exterieur in zip(equipes[::2], equipes[1::2]):
+            issue = aleatoire.random()
+            if issue < 0.45:
+                saison.append([(domicile, 3)])
+            elif issue < 0.7:
+                saison.append([(exterieur, 3)])
+            else:
+                saison.append([(domicile, 1), (exterieur, 1)])
+    return equipes, saison
+
+
+def avec_tri(equipes, saison):
+    teams_points = dict.fromkeys(equipes, 0)
+    for match in saison:
+        for equipe, points in match:
+            teams_points[equipe] += points
+        classement = sorted(teams_points.items(), key=lambda item: (-item[1], item[0]))
+        ucl = classement[:2]
+        europa = classement[2:5]
+    return ucl, europa
+
+
+def avec_classement(equipes, saison):
+    classement = Classement(dict.fromkeys(equipes, 0))
+    for match in saison:
+        for equipe, points in match:
+            classement.ajouter_points(equipe, points)
+        ucl = classement.plage(1, 2)
+        europa = classement.plage(3, 5)
+    return ucl, europa
+
+
+def mesurer(fonction, *args):
+    debut = time.perf_counter()
+    resultat = fonction(*args)
+    return resultat, time.perf_counter() - debut
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du classement incrémental")
+    parser.add_argument("--equipes", type=int, default=2000, help="Nombre d'équipes")
+    parser.add_argument("--journees", type=int, default=5, help="Nombre de journées")
+    parser.add_argument("--graine", type=int, default=2024, help="Graine aléatoire")
+    args = parser.parse_args()
+
+    equipes, saison = generer_saison(args.equipes, args.journees, args.graine)
+    nb_resultats = sum(len(match) for match in saison)
+    print(f"{args.equipes} équipes, {len(saison)} matchs, {nb_resultats} mises à jour")
+
+    print("Tri complet après chaque match...", flush=True)
+    attendu, duree_tri = mesurer(avec_tri, equipes, saison)
+    print("Classement incrémental...", flush=True)
+    obtenu, duree_classement = mesurer(avec_classement, equipes, saison)
+    if obtenu != attendu:
+        raise SystemExit("Erreur : les deux classements ne donnent pas les mêmes qualifiés")
+
+    print(f"Tri complet après chaque match : {duree_tri:.3f} s")
+    print(f"Classement incrémental         : {duree_classement:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
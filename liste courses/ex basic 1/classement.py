@@ -0,0 +1,138 @@
+"""
+Classement incrémental des équipes.
+
+Les équipes sont rangées dans une skip list indexable, triée par points
+décroissants puis par nom. Chaque noeud garde la largeur de ses liens, ce
+qui permet de retrouver le rang d'une équipe, le top k ou une plage de
+places en O(log n), sans retrier tout le classement à chaque résultat.
+"""
+import random
+
+NIVEAU_MAX = 32
+
+
+class Noeud:
+    def __init__(self, cle, niveau):
+        self.cle = cle
+        self.suivants = [None] * niveau
+        self.largeurs = [1] * niveau
+
+
+class Classement:
+    def __init__(self, points_equipes=None):
+        self.tete = Noeud(None, NIVEAU_MAX)
+        self.niveau = 1
+        self.points = {}
+        if points_equipes:
+            for equipe, points in points_equipes.items():
+                self.mettre_a_jour(equipe, points)
+
+    def __len__(self):
+        return len(self.points)
+
+    def __contains__(self, equipe):
+        return equipe in self.points
+
+    def __iter__(self):
+        noeud = self.tete.suivants[0]
+        while noeud is not None:
+            yield noeud.cle[1], -noeud.cle[0]
+            noeud = noeud.suivants[0]
+
+    @staticmethod
+    def _cle(equipe, points):
+        # Points décroissants, puis ordre alphabétique en cas d'égalité
+        return (-points, equipe)
+
+    def _niveau_aleatoire(self):
+        # Loi géométrique de paramètre 1/2 tirée en une fois
+        bits = random.getrandbits(NIVEAU_MAX - 1)
+        return min(NIVEAU_MAX, (bits & -bits).bit_length() or NIVEAU_MAX)
+
+    def _chemin(self, cle):
+        # Dernier noeud avant la clé à chaque niveau, et sa position (1 = premier)
+        precedents = [self.tete] * NIVEAU_MAX
+        positions = [0] * NIVEAU_MAX
+        noeud = self.tete
+        position = 0
+        for niveau in range(self.niveau - 1, -1, -1):
+            suivant = noeud.suivants[niveau]
+            while suivant is not None and suivant.cle < cle:
+                position += noeud.largeurs[niveau]
+                noeud = suivant
+                suivant = noeud.suivants[niveau]
+            precedents[niveau] = noeud
+            positions[niveau] = position
+        return precedents, positions
+
+    def _inserer(self, cle):
+        precedents, positions = self._chemin(cle)
+        niveau_noeud = self._niveau_aleatoire()
+        if niveau_noeud > self.niveau:
+            for niveau in range(self.niveau, niveau_noeud):
+                self.tete.largeurs[niveau] = len(self.points) + 1
+            self.niveau = niveau_noeud
+        noeud = Noeud(cle, niveau_noeud)
+        position = positions[0] + 1
+        for niveau in range(self.niveau):
+            precedent = precedents[niveau]
+            if niveau < niveau_noeud:
+                ecart = position - positions[niveau]
+                noeud.suivants[niveau] = precedent.suivants[niveau]
+                noeud.largeurs[niveau] = precedent.largeurs[niveau] - ecart + 1
+                precedent.suivants[niveau] = noeud
+                precedent.largeurs[niveau] = ecart
+            else:
+                precedent.largeurs[niveau] += 1
+
+    def _supprimer(self, cle):
+        precedents, _ = self._chemin(cle)
+        noeud = precedents[0].suivants[0]
+        for niveau in range(self.niveau):
+            precedent = precedents[niveau]
+            if precedent.suivants[niveau] is noeud:
+                precedent.largeurs[niveau] += noeud.largeurs[niveau] - 1
+                precedent.suivants[niveau] = noeud.suivants[niveau]
+            else:
+                precedent.largeurs[niveau] -= 1
+
+    def mettre_a_jour(self, equipe, points):
+        if equipe in self.points:
+            self._supprimer(self._cle(equipe, self.points[equipe]))
+        self.points[equipe] = points
+        self._inserer(self._cle(equipe, points))
+
+    def ajouter_points(self, equipe, points):
+        # Résultat de match : 3 points pour une victoire, 1 pour un nul
+        self.mettre_a_jour(equipe, self.points.get(equipe, 0) + points)
+
+    def retirer(self, equipe):
+        self._supprimer(self._cle(equipe, self.points.pop(equipe)))
+
+    def rang(self, equipe):
+        # Place de l'équipe dans le classement (commence à 1)
+        _, positions = self._chemin(self._cle(equipe, self.points[equipe]))
+        return positions[0] + 1
+
+    def _noeud_au_rang(self, rang):
+        noeud = self.tete
+        position = 0
+        for niveau in range(self.niveau - 1, -1, -1):
+            while noeud.suivants[niveau] is not None and position + noeud.largeurs[niveau] <= rang:
+                position += noeud.largeurs[niveau]
+                noeud = noeud.suivants[niveau]
+        return noeud
+
+    def plage(self, debut, fin):
+        # Équipes classées de la place debut à la place fin incluses
+        resultat = []
+        if debut < 1 or debut > len(self.points):
+            return resultat
+        noeud = self._noeud_au_rang(debut)
+        for _ in range(min(fin, len(self.points)) - debut + 1):
+            resultat.append((noeud.cle[1], -noeud.cle[0]))
+            noeud = noeud.suivants[0]
+        return resultat
+
+    def top(self, k):
+        return self.plage(1, k)
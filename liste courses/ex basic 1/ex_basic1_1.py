@@ -1,3 +1,5 @@
+from classement import Classement
+
 teams_points = {
     "Paris SG": 85,
     "Lens": 84,
@@ -7,18 +9,16 @@ teams_points = {
     "Monaco": 65,
     "Lyon": 62,
 }
+classement = Classement(teams_points)
 
 def afficher_classement():
     print("Classement des équipes :")
-    for equipe, points in sorted(teams_points.items(), key=lambda item: item[1], reverse=True):
+    for equipe, points in classement:
         print(f"{equipe} : {points} points")
 
 def competitions_equipes():
-    classement = sorted(teams_points.items(), key=lambda item: item[1], reverse=True)
-    
-    
-    ucl_french_teams = [equipe for equipe, points in classement[:2]]  
-    europa_french_teams = [equipe for equipe, points in classement[2:5]]  
+    ucl_teams = [equipe for equipe, points in classement.plage(1, 2)]
+    el_teams = [equipe for equipe, points in classement.plage(3, 5)]
 
     print("Équipes qualifiées pour la Ligue des Champions (UCL) :")
     for equipe in ucl_teams:
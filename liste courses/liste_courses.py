@@ -1,9 +1,17 @@
+import os
+
+from stockage import ListeCourses
+
 # Variables
-liste_course = {
+articles_par_defaut = {
     "pates": 2,
     "sauce tomate": 1,
     "parmesan": 1
 }
+liste_course = ListeCourses(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "donnees_liste"),
+    articles_par_defaut,
+)
 
 # Fonctions
 def show_actions():
@@ -32,7 +40,7 @@ def remove_item():
     if item_input.isdigit():
         item_number = int(item_input) - 1
         if item_number >= 0 and item_number < len(liste_course):
-            item = list(liste_course.keys())[item_number]
+            item = liste_course.article(item_number)
             del liste_course[item]
         else:
             print("Numéro invalide.")
@@ -49,7 +57,7 @@ def modify_item():
     if item_input.isdigit():
         item_number = int(item_input) - 1
         if item_number >= 0 and item_number < len(liste_course):
-            item = list(liste_course.keys())[item_number]
+            item = liste_course.article(item_number)
         else:
             print("Numéro invalide.")
             return
@@ -82,6 +90,7 @@ def main():
             modify_item()
         elif choice == "4":
             print("À bientôt")
+            liste_course.fermer()
             break
         else:
             print("Choix invalide, veuillez réessayer.")
@@ -0,0 +1,352 @@
+"""
+Stockage persistant de la liste de courses.
+
+Les articles sont gardés en mémoire dans un dictionnaire nom -> quantité,
+accompagné d'un index de positions (arbre de Fenwick) pour retrouver le
+n-ième article en O(log n). Chaque modification est ajoutée à un journal
+(append-only), synchronisé sur disque par lots. Une compaction en tâche de
+fond réécrit l'état complet dans un instantané, et le démarrage ne rejoue
+que les segments de journal postérieurs à cet instantané.
+"""
+import json
+import os
+import threading
+
+FICHIER_INSTANTANE = "instantane.json"
+PREFIXE_JOURNAL = "journal."
+
+
+# Index des positions : un arbre de Fenwick sur les emplacements d'insertion.
+# Chaque article reçoit un emplacement croissant ; un emplacement vaut 1 s'il
+# est occupé, 0 si l'article a été supprimé.
+class IndexPositions:
+    def __init__(self):
+        self.arbre = [0]
+        self.occupes = []
+
+    def construire(self, nombre):
+        # Construction en O(n) pour un instantané où tous les emplacements sont occupés
+        self.occupes = [1] * nombre
+        self.arbre = [0] + self.occupes
+        for i in range(1, nombre + 1):
+            parent = i + (i & -i)
+            if parent <= nombre:
+                self.arbre[parent] += self.arbre[i]
+
+    def _somme(self, fin):
+        total = 0
+        while fin > 0:
+            total += self.arbre[fin]
+            fin -= fin & -fin
+        return total
+
+    def _ajouter(self, emplacement, delta):
+        i = emplacement + 1
+        while i < len(self.arbre):
+            self.arbre[i] += delta
+            i += i & -i
+
+    def nouvel_emplacement(self):
+        emplacement = len(self.occupes)
+        self.occupes.append(1)
+        # Le nouveau noeud couvre l'intervalle ]i - lowbit(i), i]
+        i = emplacement + 1
+        self.arbre.append(1 + self._somme(i - 1) - self._somme(i - (i & -i)))
+        return emplacement
+
+    def liberer(self, emplacement):
+        if self.occupes[emplacement]:
+            self.occupes[emplacement] = 0
+            self._ajouter(emplacement, -1)
+
+    def emplacement_de_rang(self, rang):
+        # Renvoie l'emplacement du rang-ième article vivant (rang commence à 0)
+        pos = 0
+        reste = rang + 1
+        pas = 1 << (len(self.arbre) - 1).bit_length()
+        while pas:
+            suivant = pos + pas
+            if suivant < len(self.arbre) and self.arbre[suivant] < reste:
+                pos = suivant
+                reste -= self.arbre[suivant]
+            pas >>= 1
+        return pos
+
+
+# État en mémoire : quantités, emplacements et index des positions. La
+# compaction en construit un nouveau en tâche de fond puis le substitue à
+# l'ancien, qui n'est plus modifié ensuite.
+class EtatListe:
+    def __init__(self):
+        self.quantites = {}
+        self.emplacements = {}
+        self.noms = []
+        self.index = IndexPositions()
+
+    def items(self):
+        # Références prises une fois pour toutes : le parcours reste cohérent
+        # même si une compaction remplace l'état entre deux articles
+        noms = self.noms
+        occupes = self.index.occupes
+        quantites = self.quantites
+        for emplacement, nom in enumerate(noms):
+            if occupes[emplacement]:
+                yield nom, quantites[nom]
+
+    def article(self, position):
+        return self.noms[self.index.emplacement_de_rang(position)]
+
+    def modifier(self, nom, quantite):
+        if nom not in self.quantites:
+            self.emplacements[nom] = self.index.nouvel_emplacement()
+            self.noms.append(nom)
+        self.quantites[nom] = quantite
+
+    def supprimer(self, nom):
+        del self.quantites[nom]
+        self.index.liberer(self.emplacements.pop(nom))
+
+    def appliquer(self, operation):
+        if operation["op"] == "set":
+            self.modifier(operation["nom"], operation["qte"])
+        elif operation["nom"] in self.quantites:
+            self.supprimer(operation["nom"])
+
+    def reconstruire(self, articles):
+        # Repart d'emplacements tous occupés, sans ceux des articles supprimés
+        self.noms = [nom for nom, quantite in articles]
+        self.quantites = dict(articles)
+        self.emplacements = {nom: emplacement for emplacement, nom in enumerate(self.noms)}
+        self.index = IndexPositions()
+        self.index.construire(len(self.noms))
+
+
+class ListeCourses:
+    def __init__(self, dossier, articles_par_defaut=None, lot_fsync=64, seuil_compaction=10000):
+        self.dossier = dossier
+        self.lot_fsync = lot_fsync
+        self.seuil_compaction = seuil_compaction
+        self.etat = EtatListe()
+        self.verrou = threading.Lock()
+        self.compaction = None
+        self.erreur_compaction = None
+        self.operations_rotation = None
+        self.en_attente = 0
+        self.operations_segment = 0
+
+        os.makedirs(dossier, exist_ok=True)
+        nouveau, segment_instantane = self._charger(self.etat)
+        self.segment = max(self._segments() + [segment_instantane])
+        self._ouvrir_journal()
+        if nouveau and articles_par_defaut:
+            for nom, quantite in articles_par_defaut.items():
+                self[nom] = quantite
+            self.synchroniser()
+
+    # Accès aux articles
+    def __len__(self):
+        return len(self.etat.quantites)
+
+    def __contains__(self, nom):
+        return nom in self.etat.quantites
+
+    def __getitem__(self, nom):
+        return self.etat.quantites[nom]
+
+    def __setitem__(self, nom, quantite):
+        with self.verrou:
+            self.etat.modifier(nom, quantite)
+            self._ecrire({"op": "set", "nom": nom, "qte": quantite})
+
+    def __delitem__(self, nom):
+        with self.verrou:
+            if nom not in self.etat.quantites:
+                raise KeyError(nom)
+            self.etat.supprimer(nom)
+            self._ecrire({"op": "del", "nom": nom})
+
+    def items(self):
+        return self.etat.items()
+
+    def article(self, position):
+        # Renvoie le nom de l'article à la position donnée (commence à 0)
+        etat = self.etat
+        if position < 0 or position >= len(etat.quantites):
+            raise IndexError(position)
+        return etat.article(position)
+
+    # Journal
+    def _chemin_segment(self, numero):
+        return os.path.join(self.dossier, f"{PREFIXE_JOURNAL}{numero:08d}")
+
+    def _segments(self):
+        numeros = []
+        for fichier in os.listdir(self.dossier):
+            if fichier.startswith(PREFIXE_JOURNAL) and fichier[len(PREFIXE_JOURNAL):].isdigit():
+                numeros.append(int(fichier[len(PREFIXE_JOURNAL):]))
+        return sorted(numeros)
+
+    def _ouvrir_journal(self):
+        chemin = self._chemin_segment(self.segment)
+        nouveau_segment = not os.path.exists(chemin)
+        self.journal = open(chemin, "a", encoding="utf-8")
+        if nouveau_segment:
+            self._synchroniser_dossier()
+
+    def _synchroniser_dossier(self):
+        # Rend durables les créations, renommages et suppressions de fichiers.
+        # Windows ne permet pas d'ouvrir un dossier pour le synchroniser.
+        if os.name == "nt":
+            return
+        descripteur = os.open(self.dossier, os.O_RDONLY)
+        try:
+            os.fsync(descripteur)
+        finally:
+            os.close(descripteur)
+
+    def _ecrire(self, operation):
+        self.journal.write(json.dumps(operation, ensure_ascii=False) + "\n")
+        if self.operations_rotation is not None:
+            self.operations_rotation.append(operation)
+        self.en_attente += 1
+        self.operations_segment += 1
+        if self.en_attente >= self.lot_fsync:
+            self._synchroniser()
+        # Le seuil grandit avec la liste pour que chaque instantané réécrit
+        # soit amorti par au moins autant d'opérations
+        seuil = max(self.seuil_compaction, len(self.etat.quantites))
+        if self.operations_segment >= seuil and self.compaction is None:
+            self._lancer_compaction()
+
+    def _synchroniser(self):
+        self.journal.flush()
+        os.fsync(self.journal.fileno())
+        self.en_attente = 0
+
+    def synchroniser(self):
+        with self.verrou:
+            self._synchroniser()
+
+    # Chargement : instantané puis rejeu des segments suivants, jusqu'au
+    # segment limite exclu s'il est donné
+    def _charger(self, etat, limite=None):
+        segment_instantane = 0
+        chemin = os.path.join(self.dossier, FICHIER_INSTANTANE)
+        nouveau = True
+        if os.path.exists(chemin):
+            with open(chemin, encoding="utf-8") as fichier:
+                instantane = json.load(fichier)
+            segment_instantane = instantane["segment"]
+            etat.reconstruire(instantane["articles"])
+            nouveau = False
+        for numero in self._segments():
+            if numero < segment_instantane or (limite is not None and numero >= limite):
+                continue
+            nouveau = False
+            self._rejouer(self._chemin_segment(numero), etat)
+        return nouveau, segment_instantane
+
+    def _rejouer(self, chemin, etat):
+        with open(chemin, "rb+") as fichier:
+            fin_valide = 0
+            while True:
+                ligne = fichier.readline()
+                if not ligne:
+                    break
+                try:
+                    if not ligne.endswith(b"\n"):
+                        raise ValueError("ligne incomplète")
+                    operation = json.loads(ligne)
+                except ValueError:
+                    if fichier.read(1):
+                        raise ValueError(f"Journal corrompu : {chemin} (octet {fin_valide})")
+                    # Dernière ligne tronquée par un arrêt brutal : on la coupe pour
+                    # que les prochaines écritures ne soient pas collées à la suite
+                    fichier.truncate(fin_valide)
+                    fichier.flush()
+                    os.fsync(fichier.fileno())
+                    break
+                fin_valide += len(ligne)
+                etat.appliquer(operation)
+
+    # Compaction
+    def _lancer_compaction(self):
+        # Appelé sous verrou : on bascule seulement sur un nouveau segment, tout
+        # le travail en O(n) est fait par le thread de compaction
+        self._synchroniser()
+        self.journal.close()
+        self.segment += 1
+        self.operations_segment = 0
+        self._ouvrir_journal()
+        self.operations_rotation = []
+        self.compaction = threading.Thread(
+            target=self._compacter, args=(self.segment,), daemon=True
+        )
+        self.compaction.start()
+
+    def _compacter(self, segment):
+        chemin = os.path.join(self.dossier, FICHIER_INSTANTANE)
+        temporaire = chemin + ".tmp"
+        try:
+            # Les segments antérieurs sont fermés : on relit l'état tel qu'il
+            # était à la bascule, sans toucher à celui utilisé pour les écritures
+            etat = EtatListe()
+            self._charger(etat, segment)
+            articles = list(etat.items())
+            etat.reconstruire(articles)
+            with self.verrou:
+                for operation in self.operations_rotation:
+                    etat.appliquer(operation)
+                self.etat = etat
+                self.operations_rotation = None
+
+            with open(temporaire, "w", encoding="utf-8") as fichier:
+                json.dump({"segment": segment, "articles": articles}, fichier, ensure_ascii=False)
+                fichier.flush()
+                os.fsync(fichier.fileno())
+            os.replace(temporaire, chemin)
+            # Le renommage doit être sur disque avant la suppression des segments
+            self._synchroniser_dossier()
+            for numero in self._segments():
+                if numero < segment:
+                    os.remove(self._chemin_segment(numero))
+        except Exception as erreur:
+            # Les anciens segments restent en place : rien n'est perdu, et
+            # l'erreur est remontée par compacter() ou fermer()
+            if os.path.exists(temporaire):
+                os.remove(temporaire)
+            with self.verrou:
+                self.erreur_compaction = erreur
+        finally:
+            with self.verrou:
+                self.operations_rotation = None
+                self.compaction = None
+
+    def _verifier_compaction(self):
+        erreur = self.erreur_compaction
+        if erreur is not None:
+            self.erreur_compaction = None
+            raise erreur
+
+    def compacter(self):
+        # Une compaction déjà en cours ne couvre pas les écritures faites
+        # depuis sa bascule : on l'attend, puis on en lance une nouvelle
+        while True:
+            with self.verrou:
+                compaction = self.compaction
+                if compaction is None:
+                    self._lancer_compaction()
+                    compaction = self.compaction
+                    break
+            compaction.join()
+        compaction.join()
+        self._verifier_compaction()
+
+    def fermer(self):
+        compaction = self.compaction
+        if compaction is not None:
+            compaction.join()
+        with self.verrou:
+            self._synchroniser()
+            self.journal.close()
+        self._verifier_compaction()
@@ -0,0 +1,100 @@
+import os
+import random
+from unittest import mock
+
+import pytest
+
+from stockage import ListeCourses
+
+
+def segments(dossier):
+    return sorted(f for f in os.listdir(dossier) if f.startswith("journal."))
+
+
+def verifier(liste, reference):
+    assert list(liste.items()) == list(reference.items())
+    assert len(liste) == len(reference)
+    for position, nom in enumerate(reference):
+        assert liste.article(position) == nom
+
+
+def test_aleatoire_comme_un_dict(tmp_path):
+    aleatoire = random.Random(2024)
+    liste = ListeCourses(tmp_path, lot_fsync=7, seuil_compaction=50)
+    reference = {}
+    for i in range(3000):
+        nom = f"article {aleatoire.randint(0, 200)}"
+        if nom in reference and aleatoire.random() < 0.3:
+            del liste[nom]
+            del reference[nom]
+        else:
+            liste[nom] = i
+            reference[nom] = i
+        if i % 250 == 0:
+            verifier(liste, reference)
+    liste.fermer()
+
+    liste = ListeCourses(tmp_path)
+    verifier(liste, reference)
+    liste.fermer()
+
+
+def test_modifier_pendant_le_parcours(tmp_path):
+    liste = ListeCourses(tmp_path, seuil_compaction=5)
+    for i in range(30):
+        liste[f"a{i}"] = i
+    for i in range(0, 30, 2):
+        del liste[f"a{i}"]
+    liste.compacter()
+    for nom, quantite in liste.items():
+        liste[nom] = quantite + 1
+    liste.fermer()
+
+    liste = ListeCourses(tmp_path)
+    assert list(liste.items()) == [(f"a{i}", i + 1) for i in range(1, 30, 2)]
+    liste.fermer()
+
+
+def test_derniere_ligne_tronquee(tmp_path):
+    liste = ListeCourses(tmp_path, {"a": 1, "b": 2})
+    liste.fermer()
+    with open(tmp_path / segments(tmp_path)[-1], "a", encoding="utf-8") as fichier:
+        fichier.write('{"op": "se')
+
+    liste = ListeCourses(tmp_path)
+    liste["c"] = 3
+    liste["d"] = 4
+    del liste["a"]
+    liste.fermer()
+
+    liste = ListeCourses(tmp_path)
+    assert list(liste.items()) == [("b", 2), ("c", 3), ("d", 4)]
+    liste.fermer()
+
+
+def test_ligne_corrompue_au_milieu(tmp_path):
+    liste = ListeCourses(tmp_path, {"a": 1})
+    liste.fermer()
+    with open(tmp_path / segments(tmp_path)[-1], "a", encoding="utf-8") as fichier:
+        fichier.write('pas du json\n{"op": "del", "nom": "a"}\n')
+
+    with pytest.raises(ValueError, match="Journal corrompu"):
+        ListeCourses(tmp_path)
+
+
+def test_compaction_en_echec(tmp_path):
+    liste = ListeCourses(tmp_path, {"a": 1}, seuil_compaction=10**9)
+    with mock.patch("stockage.json.dump", side_effect=OSError("disque plein")):
+        with pytest.raises(OSError, match="disque plein"):
+            liste.compacter()
+    assert liste.compaction is None
+    assert not os.path.exists(tmp_path / "instantane.json.tmp")
+
+    liste["b"] = 2
+    liste.compacter()
+    liste.fermer()
+
+    liste = ListeCourses(tmp_path)
+    assert list(liste.items()) == [("a", 1), ("b", 2)]
+    assert len(segments(tmp_path)) == 1
+    liste.fermer()